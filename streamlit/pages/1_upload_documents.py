@@ -1,10 +1,10 @@
 import pandas as pd
 from dotenv import load_dotenv
+from utils.cache import cached_indexes, cached_stats
 from utils.pinecone_utils import (
-    get_active_indexes,
-    get_index_stats,
-    process_document,
+    process_documents,
     upload_to_pinecone,
+    using_grpc_ingest,
 )
 
 import streamlit as st
@@ -13,6 +13,25 @@ import streamlit as st
 load_dotenv()
 
 
+# Widget keys cleared when starting a new upload; scoped to the form so
+# cached resources elsewhere in session state survive the reset
+_FORM_KEYS = (
+    "title",
+    "description",
+    "tags",
+    "author",
+    "date_created",
+    "upload_namespace",
+    "new_namespace",
+)
+
+
+def _reset_form():
+    """Clear only the upload form's widget state."""
+    for key in _FORM_KEYS:
+        st.session_state.pop(key, None)
+
+
 def get_metadata():
     """Collect metadata from form."""
     metadata = {}
@@ -38,7 +57,7 @@ def upload_documents_page():
 
     # Get active indexes
     try:
-        indexes = get_active_indexes()
+        indexes = cached_indexes()
         if not indexes:
             st.error("No Pinecone indexes available")
             return
@@ -47,29 +66,31 @@ def upload_documents_page():
         return
 
     # File upload with multiple file type support
-    uploaded_file = st.file_uploader(
-        "Upload Document",
+    uploaded_files = st.file_uploader(
+        "Upload Documents",
         type=["pdf", "txt", "md"],
+        accept_multiple_files=True,
         help="Supported formats: PDF, Text, and Markdown",
     )
 
-    if uploaded_file:
+    if uploaded_files:
         # Display file information
         st.write("### File Information")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.write(f"**File Name:** {uploaded_file.name}")
-            st.write(f"**File Type:** {uploaded_file.type}")
-        with col2:
-            st.write(f"**File Size:** {uploaded_file.size / 1024:.2f} KB")
+        for uploaded_file in uploaded_files:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**File Name:** {uploaded_file.name}")
+                st.write(f"**File Type:** {uploaded_file.type}")
+            with col2:
+                st.write(f"**File Size:** {uploaded_file.size / 1024:.2f} KB")
 
         # Select index and namespace
         selected_index = st.selectbox("Select Index", indexes)
 
         # Get available namespaces for the selected index
         try:
-            stats = get_index_stats(selected_index)
-            available_namespaces = list(stats.namespaces.keys())
+            stats = cached_stats(selected_index)
+            available_namespaces = list(stats["namespaces"].keys())
             # Replace empty namespace with "default" for display
             available_namespaces = [
                 "default" if ns == "" else ns for ns in available_namespaces
@@ -108,32 +129,68 @@ def upload_documents_page():
             st.subheader("Document Metadata")
             metadata = get_metadata()
 
+            # Upload tuning knobs
+            with st.expander("Advanced Upload Settings"):
+                batch_size = st.number_input(
+                    "Upsert batch size",
+                    min_value=10,
+                    max_value=500,
+                    value=100,
+                    help="Number of vectors per Pinecone upsert request",
+                )
+                if using_grpc_ingest():
+                    # The gRPC client multiplexes requests on one
+                    # channel, so there is no thread count to tune
+                    pool_threads = 30
+                    st.caption(
+                        "Uploads use the gRPC client, which multiplexes "
+                        "requests over a single connection; the thread "
+                        "count setting does not apply."
+                    )
+                else:
+                    pool_threads = st.number_input(
+                        "Parallel upload threads",
+                        min_value=1,
+                        max_value=30,
+                        value=30,
+                        help="Number of concurrent upsert requests to Pinecone",
+                    )
+
             # Upload button - only show if namespace is provided
             if namespace.strip():
-                if st.button("Upload Document"):
+                if st.button("Upload Documents"):
                     try:
-                        with st.spinner("Processing document..."):
-                            # Process document
-                            chunks = process_document(
-                                uploaded_file, metadata, namespace
+                        with st.spinner("Processing documents..."):
+                            # Process all files in parallel
+                            chunks = process_documents(
+                                uploaded_files, metadata, namespace
                             )
 
                             # Show chunk information
-                            st.info(f"Document split into {len(chunks)} chunks")
+                            st.info(
+                                f"{len(uploaded_files)} document(s) split into "
+                                f"{len(chunks)} chunks"
+                            )
 
                             with st.spinner("Uploading to Pinecone..."):
                                 # Upload to Pinecone
-                                vectorstore = upload_to_pinecone(
-                                    chunks, selected_index, namespace
+                                upload_to_pinecone(
+                                    chunks,
+                                    selected_index,
+                                    namespace,
+                                    batch_size=int(batch_size),
+                                    pool_threads=int(pool_threads),
                                 )
 
-                            st.success("Document uploaded successfully!")
+                            st.success("Documents uploaded successfully!")
 
                             # Show document details
                             with st.expander("Document Details"):
                                 st.json(
                                     {
-                                        "file_name": uploaded_file.name,
+                                        "file_names": [
+                                            f.name for f in uploaded_files
+                                        ],
                                         "chunks": len(chunks),
                                         "index": selected_index,
                                         "namespace": (
@@ -143,14 +200,12 @@ def upload_documents_page():
                                     }
                                 )
 
-                            # Show upload another button
-                            if st.button("Upload Another Document"):
-                                st.session_state["form_reset"] = (
-                                    not st.session_state.get("form_reset", False)
-                                )  # Toggle state to trigger rerun
+                            # Show upload another button; clearing the form
+                            # keys in the callback triggers the rerun
+                            st.button("Upload Another Document", on_click=_reset_form)
 
                     except Exception as e:
-                        st.error(f"Error uploading document: {str(e)}")
+                        st.error(f"Error uploading documents: {str(e)}")
                         st.exception(e)  # Show detailed error in development
             else:
                 st.error("Please enter a namespace before uploading")
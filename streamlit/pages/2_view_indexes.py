@@ -1,9 +1,9 @@
+import pandas as pd
 from dotenv import load_dotenv
+from utils.cache import cached_indexes, cached_stats
 from utils.pinecone_utils import (
     delete_index,
     delete_namespace,
-    get_active_indexes,
-    get_index_stats,
     query_index,
 )
 
@@ -13,6 +13,17 @@ import streamlit as st
 load_dotenv()
 
 
+@st.cache_data(show_spinner=False)
+def _ns_frame(ns_items):
+    """DataFrame for the namespace bar chart, cached on the (hashable) items."""
+    return pd.DataFrame(
+        {
+            "Namespace": [name for name, _ in ns_items],
+            "Vectors": [count for _, count in ns_items],
+        }
+    )
+
+
 def display_search_results(results):
     """Display search results."""
     st.subheader(f"Search Results ({results['total_results']} matches)")
@@ -42,7 +53,7 @@ def view_indexes_page():
     st.title("View & Manage Indexes")
 
     try:
-        indexes = get_active_indexes()
+        indexes = cached_indexes()
         if not indexes:
             st.warning("No active indexes found")
             return
@@ -58,8 +69,8 @@ def view_indexes_page():
 
             # Get available namespaces for the selected index
             try:
-                stats = get_index_stats(selected_index)
-                available_namespaces = list(stats.namespaces.keys())
+                stats = cached_stats(selected_index)
+                available_namespaces = list(stats["namespaces"].keys())
                 # Replace empty namespace with "default" for display
                 available_namespaces = [
                     "default" if ns == "" else ns for ns in available_namespaces
@@ -118,46 +129,42 @@ def view_indexes_page():
 
             # Show index stats
             try:
-                stats = get_index_stats(selected_index)
+                stats = cached_stats(selected_index)
                 st.write("### Namespace Statistics")
 
                 # Display namespace information
-                if stats.namespaces:
+                if stats["namespaces"]:
                     st.write("#### Namespace Distribution")
 
-                    # Create a bar chart for namespace vector counts
-                    namespace_data = {
-                        ns: ns_stats.vector_count
-                        for ns, ns_stats in stats.namespaces.items()
-                    }
-
-                    # Handle empty namespace key
-                    if "" in namespace_data:
-                        namespace_data["default"] = namespace_data.pop("")
-
-                    # Create chart data
-                    chart_data = {
-                        "Namespace": list(namespace_data.keys()),
-                        "Vectors": list(namespace_data.values()),
-                    }
+                    # Single pass over the namespaces, renaming the empty
+                    # key inline; chart and table both derive from this
+                    # (tuple so it can key the cached DataFrame)
+                    ns_items = tuple(
+                        ("default" if ns == "" else ns, vector_count)
+                        for ns, vector_count in stats["namespaces"].items()
+                    )
 
-                    # Display bar chart
+                    # Display bar chart from the cached DataFrame, skipping
+                    # Streamlit's per-rerun dict-to-DataFrame conversion
                     st.bar_chart(
-                        chart_data, x="Namespace", y="Vectors", use_container_width=True
+                        _ns_frame(ns_items),
+                        x="Namespace",
+                        y="Vectors",
+                        use_container_width=True,
                     )
 
                     # Display detailed namespace information in an expander
                     with st.expander("Detailed Namespace Information"):
-                        # Create a table for namespace details
-                        namespace_table = []
-                        for ns, ns_stats in stats.namespaces.items():
-                            namespace_table.append(
-                                {
-                                    "Namespace": "default" if ns == "" else ns,
-                                    "Vector Count": f"{ns_stats.vector_count:,}",
-                                    "Percentage": f"{ns_stats.vector_count / stats.total_vector_count:.1%}",
-                                }
-                            )
+                        # Guard against an empty index when computing percentages
+                        total_vectors = stats["total_vector_count"] or 1
+                        namespace_table = [
+                            {
+                                "Namespace": name,
+                                "Vector Count": f"{count:,}",
+                                "Percentage": f"{count / total_vectors:.1%}",
+                            }
+                            for name, count in ns_items
+                        ]
 
                         st.table(namespace_table)
                 else:
@@ -184,6 +191,7 @@ def view_indexes_page():
                                     delete_namespace(
                                         selected_index, namespace_to_delete
                                     )
+                                    cached_stats.clear()
                                     st.success(
                                         f"Namespace '{namespace_to_delete}' deleted successfully"
                                     )
@@ -209,12 +217,14 @@ def view_indexes_page():
 
             # Add a refresh button to update index stats
             if st.button("Refresh Index Stats"):
-                # Use st.rerun() to refresh the page
+                # Drop cached stats so the rerun fetches fresh data
+                cached_indexes.clear()
+                cached_stats.clear()
                 st.rerun()
 
             # Show index stats
             try:
-                stats = get_index_stats(selected_index)
+                stats = cached_stats(selected_index)
                 st.write("### Index Statistics")
 
                 # Create metrics row
@@ -222,31 +232,31 @@ def view_indexes_page():
                 with col1:
                     st.metric(
                         "Total Vectors",
-                        f"{stats.total_vector_count:,}",
+                        f"{stats['total_vector_count']:,}",
                         help="Total number of vectors in the index",
                     )
                 with col2:
                     st.metric(
                         "Dimension",
-                        stats.dimension,
+                        stats["dimension"],
                         help="Vector dimension size",
                     )
                 with col3:
                     st.metric(
                         "Index Fullness",
-                        f"{stats.index_fullness:.1%}",
+                        f"{stats['index_fullness']:.1%}",
                         help="Percentage of index capacity used",
                     )
 
                 # Show raw stats in expander
                 with st.expander("Raw Statistics"):
                     formatted_stats = {
-                        "total_vector_count": stats.total_vector_count,
-                        "dimension": stats.dimension,
-                        "index_fullness": stats.index_fullness,
+                        "total_vector_count": stats["total_vector_count"],
+                        "dimension": stats["dimension"],
+                        "index_fullness": stats["index_fullness"],
                         "namespaces": {
-                            ns: {"vector_count": ns_stats.vector_count}
-                            for ns, ns_stats in stats.namespaces.items()
+                            ns: {"vector_count": vector_count}
+                            for ns, vector_count in stats["namespaces"].items()
                         },
                     }
                     st.json(formatted_stats)
@@ -261,6 +271,8 @@ def view_indexes_page():
                     if index_to_delete:
                         try:
                             delete_index(index_to_delete)
+                            cached_indexes.clear()
+                            cached_stats.clear()
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error deleting index: {str(e)}")
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Dict
 
@@ -5,44 +6,75 @@ from dotenv import load_dotenv
 from langchain.chains import ConversationalRetrievalChain
 from langchain.chat_models import ChatOpenAI
 from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
 from langchain.vectorstores import Pinecone
-from utils.pinecone_utils import get_active_indexes, get_index_stats
+from utils.cache import cached_indexes, cached_stats
 
 import streamlit as st
 
 # Load environment variables
 load_dotenv()
 
-# Initialize memory for conversation
-memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+
+@st.cache_resource
+def get_vector_store(index_name: str, namespace: str):
+    """Build the embeddings client and vector store once per index/namespace."""
+    return Pinecone.from_existing_index(
+        index_name=index_name,
+        embedding=OpenAIEmbeddings(),
+        namespace=namespace,
+    )
+
+
+def get_llm(model: str, temperature: float):
+    """Build a chat model for the current turn.
+
+    Deliberately not cached: ChatOpenAI creates its async OpenAI client
+    (and httpx pool) at construction, and those connections are bound to
+    the event loop that first drives them. Each turn runs under a fresh
+    asyncio.run() loop, so a cached model would reuse connections from a
+    closed loop and fail every turn after the first with "Event loop is
+    closed". Construction is cheap next to the completion call.
+    """
+    return ChatOpenAI(
+        temperature=temperature,
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model=model,
+    )
 
 
 def init_session_state():
     """Initialize chat session state."""
     if "conversation" not in st.session_state:
         st.session_state.conversation = []
+    if "memory" not in st.session_state:
+        # Keep memory per session (module globals are shared across users)
+        # and windowed so the prompt stays bounded as the chat grows
+        st.session_state.memory = ConversationBufferWindowMemory(
+            k=6, memory_key="chat_history", return_messages=True
+        )
+
 
+async def query_vector_store(vector_store, query: str):
+    """Query vector store and get conversational response using LLM.
 
-def query_vector_store(vector_store, query: str):
-    """Query vector store and get conversational response using LLM."""
+    Runs the chain through its async path so the Pinecone retrieval
+    (asimilarity_search under the retriever) and the OpenAI completion
+    overlap on the event loop instead of blocking the script runner.
+    """
     try:
-        # Initialize OpenAI chat model
-        llm = ChatOpenAI(
-            temperature=0.7,  # More conversational creativity
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4o",
-        )
+        # Built per turn so the async client belongs to this turn's loop
+        llm = get_llm("gpt-4o", 0.7)  # Higher temperature for conversational creativity
 
         # Setup conversational chain
         chain = ConversationalRetrievalChain.from_llm(
             llm=llm,
             retriever=vector_store.as_retriever(),
-            memory=memory,  # Attach memory for conversation
+            memory=st.session_state.memory,  # Attach memory for conversation
             verbose=True,
         )
-        # Get response from the chain
-        response = chain.run({"question": query})
+        # Get response from the chain's async path
+        response = await chain.arun({"question": query})
 
         return response
 
@@ -51,11 +83,28 @@ def query_vector_store(vector_store, query: str):
         return None
 
 
+# Number of recent messages rendered inline; older ones render only on
+# demand so rerender cost stays bounded as the conversation grows
+_VISIBLE_MESSAGES = 50
+
+
+@st.fragment
 def render_chat_interface(vector_store):
     st.subheader("Chat Interface")
 
-    # Display conversation history
-    for message in st.session_state.conversation:
+    # Display conversation history, keeping only the recent window inline.
+    # The tail is gated on a toggle rather than an expander: Streamlit
+    # executes an expander's children on every rerun even when collapsed,
+    # so only a real branch keeps the old messages out of the rerender.
+    older_messages = st.session_state.conversation[:-_VISIBLE_MESSAGES]
+    if older_messages and st.toggle(
+        f"Show earlier messages ({len(older_messages)})", key="show_older_messages"
+    ):
+        for message in older_messages:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+
+    for message in st.session_state.conversation[-_VISIBLE_MESSAGES:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])  # Use markdown for better formatting
 
@@ -68,7 +117,7 @@ def render_chat_interface(vector_store):
 
         with st.spinner("Generating response..."):
             # Get conversational response
-            response = query_vector_store(vector_store, prompt)
+            response = asyncio.run(query_vector_store(vector_store, prompt))
 
             if response:
                 # Add assistant response to conversation
@@ -76,8 +125,9 @@ def render_chat_interface(vector_store):
                     {"role": "assistant", "content": response}
                 )
 
-                # Force refresh to show new messages
-                st.rerun()
+                # Refresh only the chat fragment to show new messages;
+                # the sidebar and vector store setup are left untouched
+                st.rerun(scope="fragment")
 
 
 def chat_interface_page():
@@ -85,7 +135,7 @@ def chat_interface_page():
     init_session_state()
 
     try:
-        indexes = get_active_indexes()
+        indexes = cached_indexes()
         if not indexes:
             st.error("No Pinecone indexes available")
             return
@@ -97,8 +147,8 @@ def chat_interface_page():
 
             # Get available namespaces for the selected index
             try:
-                stats = get_index_stats(selected_index)
-                available_namespaces = list(stats.namespaces.keys())
+                stats = cached_stats(selected_index)
+                available_namespaces = list(stats["namespaces"].keys())
 
                 # Replace empty namespace with "default" for display
                 available_namespaces = [
@@ -123,13 +173,8 @@ def chat_interface_page():
                 st.error(f"Error fetching namespaces: {str(e)}")
                 return
 
-        # Initialize vector store
-        embeddings = OpenAIEmbeddings()
-        vector_store = Pinecone.from_existing_index(
-            index_name=selected_index,
-            embedding=embeddings,
-            namespace=namespace,
-        )
+        # Initialize vector store (cached per index/namespace)
+        vector_store = get_vector_store(selected_index, namespace)
 
         # Render chat interface
         render_chat_interface(vector_store)
@@ -0,0 +1,25 @@
+from utils.pinecone_utils import get_active_indexes, get_index_stats
+
+import streamlit as st
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_indexes():
+    """Cached list of active indexes to avoid a Pinecone call on every rerun.
+
+    Shared by all pages so they draw from (and invalidate) one cache
+    instead of three page-local copies.
+    """
+    return get_active_indexes()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_stats(index_name: str):
+    """Cached index stats, flattened to a plain dict so st.cache_data can pickle it."""
+    stats = get_index_stats(index_name)
+    return {
+        "namespaces": {ns: ns_stats.vector_count for ns, ns_stats in stats.namespaces.items()},
+        "total_vector_count": stats.total_vector_count,
+        "dimension": stats.dimension,
+        "index_fullness": stats.index_fullness,
+    }
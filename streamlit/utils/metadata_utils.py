@@ -1,44 +1,59 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Tuple
 
 
-def get_metadata_template() -> Dict[str, List[str]]:
+# Static template built once at import time; tuples keep it immutable so
+# the same object can be handed out on every call
+_METADATA_TEMPLATE = {
+    "core_attributes": (
+        "title",
+        "category",
+        "subcategory",
+        "tags",
+        "keywords",
+        "description",
+        "audience",
+        "content_snippet",
+    ),
+    "functional_attributes": (
+        "purpose",
+        "question_intent",
+        "document_type",
+        "location",
+    ),
+    "technical_attributes": (
+        "date_created",
+        "date_last_updated",
+        "author",
+        "related_documents",
+    ),
+}
+
+
+def get_metadata_template() -> Dict[str, Tuple[str, ...]]:
     """
     Returns a template defining the expected metadata structure.
 
     Returns:
-        Dict[str, List[str]]: Dictionary containing metadata field categories and their fields
+        Dict[str, Tuple[str, ...]]: Dictionary containing metadata field categories and their fields
     """
-    return {
-        "core_attributes": [
-            "title",
-            "category",
-            "subcategory",
-            "tags",
-            "keywords",
-            "description",
-            "audience",
-            "content_snippet",
-        ],
-        "functional_attributes": [
-            "purpose",
-            "question_intent",
-            "document_type",
-            "location",
-        ],
-        "technical_attributes": [
-            "date_created",
-            "date_last_updated",
-            "author",
-            "related_documents",
-        ],
-    }
+    return _METADATA_TEMPLATE
+
+
+# Field sets built once at import time; frozensets give O(1) membership
+# checks in the per-document validation loop
+_REQUIRED_FIELDS = ("title", "category", "description", "tags", "keywords")
+_LIST_FIELDS = frozenset(("keywords", "audience", "question_intent", "tags", "location"))
+_DATE_FIELDS = frozenset(("date_created", "date_last_updated"))
 
 
 def validate_metadata(metadata: Dict[str, Any]) -> bool:
     """
     Validates the provided metadata against required fields and data types.
 
+    All problems are collected and reported in a single ValueError so one
+    validation pass surfaces every issue at once.
+
     Args:
         metadata (Dict[str, Any]): The metadata to validate
 
@@ -48,25 +63,25 @@ def validate_metadata(metadata: Dict[str, Any]) -> bool:
     Raises:
         ValueError: If required fields are missing or invalid
     """
+    errors = []
+
     # Check required fields
-    required_fields = ["title", "category", "description", "tags", "keywords"]
-    for field in required_fields:
+    for field in _REQUIRED_FIELDS:
         if not metadata.get(field):
-            raise ValueError(f"Missing required metadata field: {field}")
-
-    # Validate data types
-    list_fields = ["keywords", "audience", "question_intent", "tags", "location"]
-    for field in list_fields:
-        if field in metadata and not isinstance(metadata[field], list):
-            raise ValueError(f"{field} must be a list")
-
-    # Validate dates
-    date_fields = ["date_created", "date_last_updated"]
-    for field in date_fields:
-        if field in metadata:
+            errors.append(f"Missing required metadata field: {field}")
+
+    # Validate data types and dates in a single pass over the metadata
+    fromisoformat = datetime.fromisoformat
+    for field, value in metadata.items():
+        if field in _LIST_FIELDS and not isinstance(value, list):
+            errors.append(f"{field} must be a list")
+        elif field in _DATE_FIELDS:
             try:
-                datetime.fromisoformat(metadata[field])
-            except ValueError:
-                raise ValueError(f"{field} must be a valid ISO format date")
+                fromisoformat(value)
+            except (TypeError, ValueError):
+                errors.append(f"{field} must be a valid ISO format date")
+
+    if errors:
+        raise ValueError("; ".join(errors))
 
     return True
@@ -1,37 +1,158 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
 import os
 import re
-import tempfile
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from dotenv import load_dotenv
-from langchain.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredMarkdownLoader,
-)
+from langchain.embeddings import CacheBackedEmbeddings
 from langchain.embeddings.openai import OpenAIEmbeddings
+from langchain.storage import LocalFileStore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import Pinecone
+from langchain_core.documents import Document
 from pinecone import Pinecone as PineconeClient
+from pypdf import PdfReader
+
+import numpy as np
+import orjson
+import tiktoken
 
 # Load environment variables
 load_dotenv()
 
+# The gRPC client moves upserts over protobuf + HTTP/2 instead of JSON +
+# HTTP/1.1, which is worth 2-3x on bulk ingest; REST stays in place for
+# the low-volume control-plane calls. Fall back to REST everywhere when
+# the pinecone[grpc] extra is not installed or PINECONE_MODE=rest.
+try:
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
+
+_INGEST_MODE = os.getenv("PINECONE_MODE", "grpc")
+
+# RE2's non-backtracking engine scans multi-MB markdown far faster than
+# the stdlib engine; fall back to re when google-re2 is not installed
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+# Markdown cleanup as a single alternation, compiled once at import time;
+# header stripping and whitespace collapsing share one pass over the text.
+# Multiline behavior is an inline flag because google-re2 has no MULTILINE
+# constant (it takes an Options object, not the stdlib's int flags).
+_RE_MD_CLEANUP = _re_engine.compile(r"(?m)(?P<hdr>^#+\s)|(?P<ws>\s+)")
+
+
+def _md_cleanup_sub(match):
+    """Drop markdown header markers, collapse whitespace runs to one space."""
+    return "" if match.group("hdr") else " "
+
 
+@functools.lru_cache(maxsize=1)
 def init_pinecone():
-    """Initialize Pinecone client."""
+    """Initialize Pinecone client, cached so every helper shares one
+    client and its keep-alive connection pool."""
     api_key = os.getenv("PINECONE_API_KEY")
     if not api_key:
         raise ValueError("PINECONE_API_KEY not found in environment variables")
     return PineconeClient(api_key=api_key)
 
 
+@functools.lru_cache(maxsize=1)
+def _ingest_client():
+    """Client used for bulk upserts: gRPC when enabled and available,
+    otherwise the shared REST client."""
+    if _INGEST_MODE == "grpc" and PineconeGRPC is not None:
+        api_key = os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("PINECONE_API_KEY not found in environment variables")
+        return PineconeGRPC(api_key=api_key)
+    return init_pinecone()
+
+
+def using_grpc_ingest() -> bool:
+    """Whether bulk upserts go through the gRPC client.
+
+    Exposed so the UI can hide REST-only tuning knobs: the gRPC channel
+    multiplexes requests and has no thread pool to size.
+    """
+    return _INGEST_MODE == "grpc" and PineconeGRPC is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _ingest_index(index_name: str):
+    """Data-plane index handle for bulk upserts, cached per name so each
+    upload reuses one connection (one channel, for gRPC) instead of
+    opening a fresh one per call and leaking it."""
+    return _ingest_client().Index(index_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_index(index_name: str):
+    """Index handle cached per name so repeated data-plane calls reuse
+    the same connection instead of re-handshaking."""
+    return init_pinecone().Index(index_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _embeddings():
+    """Shared embeddings client so queries and uploads reuse one warm
+    HTTP connection pool to the OpenAI API."""
+    return OpenAIEmbeddings(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        chunk_size=_EMBED_BATCH_SIZE,
+        max_retries=3,
+        request_timeout=30,
+    )
+
+
+# Directory for the on-disk embedding cache; keyed by content hash, so
+# re-embedding unchanged text becomes a local file read
+_EMBED_CACHE_DIR = ".embed_cache"
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_embeddings():
+    """Embeddings client wrapped in a persistent disk cache, so identical
+    strings are only ever sent to the OpenAI API once."""
+    return CacheBackedEmbeddings.from_bytes_store(
+        _embeddings(),
+        LocalFileStore(_EMBED_CACHE_DIR),
+        namespace="text-embedding-ada-002",
+        query_embedding_cache=True,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_vectorstore(index_name: str, namespace: str):
+    """Vector store handle cached per (index, namespace)."""
+    return Pinecone.from_existing_index(
+        index_name=index_name, embedding=_cached_embeddings(), namespace=namespace
+    )
+
+
 def delete_index(index_name: str):
     """Delete an entire index."""
     try:
         pc = init_pinecone()
         pc.delete_index(index_name)
+        # Drop any cached handles pointing at the deleted index; a
+        # recreated index under the same name gets a new host, so stale
+        # vector stores would keep querying the old one
+        _get_index.cache_clear()
+        _ingest_index.cache_clear()
+        _get_vectorstore.cache_clear()
         return True
     except Exception as e:
         raise Exception(f"Error deleting index: {str(e)}")
@@ -44,85 +165,392 @@ def get_active_indexes():
 
 
 def process_document(uploaded_file, metadata: Dict, namespace: str = ""):
-    """Process uploaded document based on file type."""
+    """Process uploaded document based on file type, yielding chunks lazily."""
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=uploaded_file.name
-        ) as tmp_file:
-            # Write uploaded file content to temp file
-            tmp_file.write(uploaded_file.getvalue())
-            temp_path = tmp_file.name
-
-        # Select appropriate loader based on file type
         file_extension = uploaded_file.name.split(".")[-1].lower()
 
         if file_extension == "pdf":
-            loader = PyPDFLoader(temp_path)
-        elif file_extension == "md":
-            loader = UnstructuredMarkdownLoader(temp_path)
-            # Enhance preprocessing for markdown
-            documents = loader.load()
-            for doc in documents:
-                # Example: Remove markdown headers
-                doc.page_content = re.sub(
-                    r"^#+\s", "", doc.page_content, flags=re.MULTILINE
+            # pypdf reads lazily from the seekable upload handle, so the
+            # file is parsed page by page instead of being buffered whole
+            # through a temp copy on disk
+            reader = PdfReader(uploaded_file)
+            documents = (
+                Document(
+                    page_content=page.extract_text() or "",
+                    metadata={"page": page_number},
                 )
-                # Example: Normalize whitespace
-                doc.page_content = re.sub(r"\s+", " ", doc.page_content).strip()
-        elif file_extension == "txt":
-            loader = TextLoader(temp_path)
+                for page_number, page in enumerate(reader.pages)
+            )
+        elif file_extension in ("md", "txt"):
+            # Decode straight from the upload handle; the path-based
+            # loaders would only add a disk write/read round-trip
+            uploaded_file.seek(0)
+            text = uploaded_file.read().decode("utf-8", errors="replace")
+
+            if file_extension == "md":
+                # Remove markdown headers and normalize whitespace in one pass
+                text = _RE_MD_CLEANUP.sub(_md_cleanup_sub, text).strip()
+
+            documents = [Document(page_content=text, metadata={})]
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
 
-        # Load documents
-        documents = loader.load()
-
-        # Add metadata to documents
-        for doc in documents:
-            doc.metadata.update(metadata)
-            doc.metadata.update(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "file_type": file_extension,
-                    "source": uploaded_file.name,
-                }
-            )
+        # Build the shared metadata once, interning string values so every
+        # chunk references the same objects instead of per-chunk copies
+        shared_metadata = {
+            key: sys.intern(value) if isinstance(value, str) else value
+            for key, value in metadata.items()
+        }
+        shared_metadata.update(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "file_type": sys.intern(file_extension),
+                "source": sys.intern(uploaded_file.name),
+            }
+        )
 
         # Split documents into chunks with overlap
-        # chunk_size: Number of characters in each chunk
-        # chunk_overlap: Number of characters that overlap between chunks
-        # Example: With chunk_size=1000 and chunk_overlap=200:
-        #   Chunk 1: characters 0-1000
-        #   Chunk 2: characters 800-1800 (overlaps with end of Chunk 1)
-        #   Chunk 3: characters 1600-2600 (overlaps with end of Chunk 2)
-        # This overlap ensures that concepts/phrases that might be split between chunks
-        # are fully captured in at least one chunk, improving search quality
+        # chunk_size: Number of tokens in each chunk
+        # chunk_overlap: Number of tokens that overlap between chunks
+        # Sizes are measured in tokens (via tiktoken) rather than characters
+        # so chunks line up with the embedding model's token budget and
+        # embedding batches can be packed predictably.
+        # The overlap ensures that concepts/phrases that might be split
+        # between chunks are fully captured in at least one chunk,
+        # improving search quality
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
+            chunk_size=512,
+            chunk_overlap=50,
+            length_function=_token_len,
             separators=["\n\n", "\n", " ", ""],
         )
-        chunks = text_splitter.split_documents(documents)
 
-        # Cleanup temporary file
-        os.remove(temp_path)
-        return chunks
+        # Stream chunks out one document (PDF page) at a time so the
+        # whole file never has to be split and held in memory at once.
+        # Each chunk is stamped with its position within this file, so
+        # vector IDs stay stable no matter which other files share the
+        # upload batch.
+        chunk_index = 0
+        for doc in documents:
+            doc.metadata.update(shared_metadata)
+            for chunk in text_splitter.split_documents([doc]):
+                chunk.metadata["chunk_index"] = chunk_index
+                chunk_index += 1
+                yield chunk
 
     except Exception as e:
-        if "temp_path" in locals() and os.path.exists(temp_path):
-            os.remove(temp_path)
         raise Exception(f"Error processing document: {str(e)}")
 
 
-def upload_to_pinecone(chunks: List, index_name: str, namespace: str = ""):
-    """Upload document chunks to Pinecone."""
+def process_documents(
+    uploaded_files: List, metadata: Dict, namespace: str = "", max_workers: int = 8
+):
+    """Process several uploaded documents in parallel.
+
+    pypdf parsing is pure Python and serializes on the GIL, but reads
+    from the upload handles and token counting in tiktoken's Rust
+    extension do not, so a thread pool still overlaps a useful share of
+    the per-file work. Chunks are returned in upload order so a single
+    upload_to_pinecone call can ingest them as one big batch.
+    """
+    try:
+        def _process(uploaded_file):
+            # Materialize per file so the chunking work actually runs on
+            # the pool rather than when the generator is consumed
+            return list(process_document(uploaded_file, metadata, namespace))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_process, uploaded_file)
+                for uploaded_file in uploaded_files
+            ]
+            return list(
+                itertools.chain.from_iterable(future.result() for future in futures)
+            )
+    except Exception as e:
+        raise Exception(f"Error processing documents: {str(e)}")
+
+
+# Number of texts sent per OpenAI embeddings request; one large request
+# amortizes the HTTP round-trip over hundreds of chunks
+_EMBED_BATCH_SIZE = 512
+
+# Tokenizer matching the embedding model, used to size chunks in tokens
+_ENCODING = tiktoken.encoding_for_model("text-embedding-ada-002")
+
+
+@functools.lru_cache(maxsize=8192)
+def _token_len(text: str) -> int:
+    """Token count for the splitter; cached because splitting re-measures
+    the same candidate segments repeatedly."""
+    return len(_ENCODING.encode(text, disallowed_special=()))
+
+
+def _batch_iter(iterable, batch_size: int):
+    """Yield successive batches of batch_size items from an iterable."""
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def _chunk_id(chunk, chunk_index: int) -> str:
+    """Deterministic vector ID derived from the chunk's source and content.
+
+    The per-file chunk_index stamped by process_document takes priority
+    over the caller's position in the upload stream, so re-ingesting an
+    unchanged file produces the same IDs — regardless of which other
+    files share the batch — and Pinecone overwrites the existing vectors
+    instead of accumulating duplicates.
+    """
+    key = (
+        f"{chunk.metadata.get('source', '')}|{chunk.metadata.get('page', 0)}"
+        f"|{chunk.metadata.get('chunk_index', chunk_index)}|{chunk.page_content}"
+    )
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+# Int8 quantization shrinks each 1536-dim fp32 vector from ~6KB to
+# ~1.5KB, cutting upsert bandwidth and index storage 4x with under 1%
+# recall loss on OpenAI embeddings. It requires an index created with
+# vector_type="int8", so it is opt-in via the environment.
+_QUANTIZE_INT8 = os.getenv("PINECONE_INT8", "").lower() in ("1", "true", "yes")
+
+
+def _quantize_int8(vector):
+    """Scale a float vector to int8 by its max absolute value.
+
+    Returns the int8 components plus the scale factor; keeping the scale
+    in metadata lets clients recover approximate fp32 values later.
+    """
+    array = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(array).max()) or 1.0
+    quantized = np.clip(array / scale * 127, -128, 127).astype(np.int8)
+    return quantized.tolist(), scale
+
+
+def _vector_payload(chunk, chunk_index: int, vector):
+    """Build one (id, values, metadata) upsert tuple, quantizing when enabled.
+
+    The "text" metadata key is what LangChain's Pinecone vectorstore
+    reads back at query time, so it rides alongside the user metadata.
+    """
+    metadata = {"text": chunk.page_content, **chunk.metadata}
+    if _QUANTIZE_INT8:
+        vector, metadata["quant_scale"] = _quantize_int8(vector)
+    return (_chunk_id(chunk, chunk_index), vector, metadata)
+
+
+def _wait_for_upsert(index, async_result, batch, namespace: str, max_retries: int = 3):
+    """Wait on an async upsert, retrying synchronously with backoff on failure."""
     try:
-        embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
-        return Pinecone.from_documents(
-            chunks, embeddings, index_name=index_name, namespace=namespace
+        # REST async results expose get(); gRPC futures expose result()
+        waiter = getattr(async_result, "get", None) or async_result.result
+        return waiter()
+    except Exception:
+        delay = 1.0
+        for attempt in range(max_retries):
+            try:
+                return index.upsert(vectors=batch, namespace=namespace)
+            except Exception:
+                if attempt == max_retries - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+
+def _embed_via_batch_api(texts: List[str], poll_interval: float = 30.0) -> List[List[float]]:
+    """Embed texts through the OpenAI Batch API.
+
+    Meant for large ingestion runs where latency is not user-facing:
+    batch jobs cost half as much as synchronous embedding calls and run
+    under much higher rate limits, at the price of polling until the job
+    completes.
+    """
+    from openai import OpenAI
+
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    # One JSONL request line per chunk, keyed by position; orjson emits
+    # minified bytes directly, far faster than stdlib json on thousands
+    # of lines
+    lines = b"\n".join(
+        orjson.dumps(
+            {
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {"model": "text-embedding-ada-002", "input": text},
+            }
         )
+        for i, text in enumerate(texts)
+    )
+
+    batch_file = client.files.create(file=io.BytesIO(lines), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/embeddings",
+        completion_window="24h",
+    )
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise Exception(f"Embedding batch job {batch.id} ended with status: {batch.status}")
+
+    # Output lines are not guaranteed to be in input order, so map by id.
+    # Individual requests can fail even when the job completes, so check
+    # each line before trusting its response body.
+    vectors_by_id = {}
+    failed_ids = []
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        result = orjson.loads(line)
+        response = result.get("response")
+        if result.get("error") or not response or response.get("status_code") != 200:
+            failed_ids.append(result.get("custom_id", "<unknown>"))
+            continue
+        vectors_by_id[result["custom_id"]] = response["body"]["data"][0]["embedding"]
+
+    # Requests that never produced an output line count as failed too
+    missing_ids = [
+        f"chunk-{i}" for i in range(len(texts)) if f"chunk-{i}" not in vectors_by_id
+    ]
+    failed_ids = sorted(set(failed_ids) | set(missing_ids))
+    if failed_ids:
+        raise Exception(
+            f"Embedding batch job {batch.id} failed for {len(failed_ids)} "
+            f"request(s): {', '.join(failed_ids[:10])}"
+            f"{'...' if len(failed_ids) > 10 else ''} "
+            f"(details in error file {batch.error_file_id})"
+        )
+
+    return [vectors_by_id[f"chunk-{i}"] for i in range(len(texts))]
+
+
+def upload_to_pinecone(
+    chunks: Iterable,
+    index_name: str,
+    namespace: str = "",
+    batch_size: int = 100,
+    pool_threads: int = 30,
+    max_in_flight: int = 10,
+    async_batch: bool = False,
+):
+    """Upload document chunks to Pinecone using batched, parallel upserts.
+
+    chunks may be any iterable (including the generator returned by
+    process_document). It is consumed one embedding group at a time:
+    each group is embedded with a single /embeddings call, upserted in
+    batches of batch_size vectors with async_req=True (up to
+    max_in_flight requests overlap on the index's thread pool), and then
+    dropped — so peak memory stays bounded regardless of document size.
+
+    With async_batch=True, embeddings go through the OpenAI Batch API
+    instead of synchronous calls — slower to complete but half the cost
+    and free of interactive rate limits, for bulk backfill runs.
+    """
+    try:
+        if using_grpc_ingest():
+            # The cached channel multiplexes concurrent upserts over one
+            # HTTP/2 connection, so there is no thread pool to size or
+            # tear down — hence no context manager either
+            index_cm = contextlib.nullcontext(_ingest_index(index_name))
+        else:
+            # Context manager tears down the upsert thread pool when done
+            index_cm = _ingest_client().Index(index_name, pool_threads=pool_threads)
+        with index_cm as index:
+            # Keep a bounded window of in-flight requests to respect rate limits
+            in_flight = []
+            total_upserted = 0
+            chunk_offset = 0
+
+            for group in _batch_iter(chunks, _EMBED_BATCH_SIZE):
+                texts = [chunk.page_content for chunk in group]
+                if async_batch:
+                    group_vectors = _embed_via_batch_api(texts)
+                else:
+                    group_vectors = _cached_embeddings().embed_documents(texts)
+
+                vectors = [
+                    _vector_payload(chunk, chunk_offset + i, vector)
+                    for i, (chunk, vector) in enumerate(zip(group, group_vectors))
+                ]
+                chunk_offset += len(group)
+
+                for batch in _batch_iter(vectors, batch_size):
+                    if len(in_flight) >= max_in_flight:
+                        oldest_result, oldest_batch = in_flight.pop(0)
+                        _wait_for_upsert(index, oldest_result, oldest_batch, namespace)
+                        total_upserted += len(oldest_batch)
+                    async_result = index.upsert(
+                        vectors=batch, namespace=namespace, async_req=True
+                    )
+                    in_flight.append((async_result, batch))
+
+            for async_result, batch in in_flight:
+                _wait_for_upsert(index, async_result, batch, namespace)
+                total_upserted += len(batch)
+
+        return total_upserted
+    except Exception as e:
+        raise Exception(f"Error uploading to Pinecone: {str(e)}")
+
+
+async def upload_to_pinecone_async(
+    chunks: List,
+    index_name: str,
+    namespace: str = "",
+    batch_size: int = 100,
+    embed_workers: int = 16,
+    upsert_concurrency: int = 30,
+):
+    """Upload document chunks with embedding and upsert stages overlapped.
+
+    A producer feeds fixed-size batches through a bounded queue to a pool
+    of workers that embed via the async OpenAI client and upsert from
+    worker threads, so embedding batch N overlaps with upserting batch
+    N-1 instead of the two stages running back to back. Both stages are
+    network-bound, which is why an asyncio pipeline is the right shape.
+    """
+    try:
+        embeddings = _cached_embeddings()
+        index = _ingest_index(index_name)
+
+        # Bounded queue applies backpressure so splitting never runs far
+        # ahead of what the embed/upsert stages can drain
+        queue = asyncio.Queue(maxsize=4)
+        upsert_limit = asyncio.Semaphore(upsert_concurrency)
+        total_upserted = 0
+
+        async def producer():
+            chunk_offset = 0
+            for batch in _batch_iter(chunks, batch_size):
+                await queue.put((chunk_offset, batch))
+                chunk_offset += len(batch)
+            for _ in range(embed_workers):
+                await queue.put(None)
+
+        async def worker():
+            nonlocal total_upserted
+            while (item := await queue.get()) is not None:
+                chunk_offset, batch = item
+                vectors_list = await embeddings.aembed_documents(
+                    [chunk.page_content for chunk in batch]
+                )
+                payload = [
+                    _vector_payload(chunk, chunk_offset + i, vector)
+                    for i, (chunk, vector) in enumerate(zip(batch, vectors_list))
+                ]
+                async with upsert_limit:
+                    await asyncio.to_thread(
+                        index.upsert, vectors=payload, namespace=namespace
+                    )
+                total_upserted += len(payload)
+
+        await asyncio.gather(producer(), *(worker() for _ in range(embed_workers)))
+
+        return total_upserted
     except Exception as e:
         raise Exception(f"Error uploading to Pinecone: {str(e)}")
 
@@ -130,8 +558,7 @@ def upload_to_pinecone(chunks: List, index_name: str, namespace: str = ""):
 def delete_namespace(index_name: str, namespace: str):
     """Delete all vectors in a namespace."""
     try:
-        pc = init_pinecone()
-        index = pc.Index(index_name)
+        index = _get_index(index_name)
         index.delete(delete_all=True, namespace=namespace)
         return True
     except Exception as e:
@@ -141,8 +568,7 @@ def delete_namespace(index_name: str, namespace: str):
 def get_index_stats(index_name: str):
     """Get statistics for a Pinecone index."""
     try:
-        pc = init_pinecone()
-        index = pc.Index(index_name)
+        index = _get_index(index_name)
         stats = index.describe_index_stats()
         return stats
     except Exception as e:
@@ -152,25 +578,43 @@ def get_index_stats(index_name: str):
 def query_index(index_name: str, query: str, namespace: str = "", top_k: int = 5):
     """Query Pinecone index."""
     try:
-        embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
-        vectorstore = Pinecone.from_existing_index(
-            index_name=index_name, embedding=embeddings, namespace=namespace
-        )
-
-        docs = vectorstore.similarity_search(query, k=top_k, namespace=namespace)
+        if _QUANTIZE_INT8:
+            # An int8 index has to be queried with an int8 vector scaled
+            # the same way as the stored ones; the LangChain vectorstore
+            # only sends fp32, so embed and query the index directly
+            query_vector, _ = _quantize_int8(_cached_embeddings().embed_query(query))
+            results = _get_index(index_name).query(
+                vector=query_vector,
+                top_k=top_k,
+                namespace=namespace,
+                include_metadata=True,
+            )
+            matches = [
+                {
+                    "content": match["metadata"].pop("text", ""),
+                    "metadata": match["metadata"],
+                    "score": match["score"],
+                }
+                for match in results["matches"]
+            ]
+        else:
+            vectorstore = _get_vectorstore(index_name, namespace)
 
-        return {
-            "query": query,
-            "matches": [
+            docs = vectorstore.similarity_search(query, k=top_k, namespace=namespace)
+            matches = [
                 {
                     "content": doc.page_content,
                     "metadata": doc.metadata,
                     "score": getattr(doc, "score", None),
                 }
                 for doc in docs
-            ],
+            ]
+
+        return {
+            "query": query,
+            "matches": matches,
             "namespace": namespace,
-            "total_results": len(docs),
+            "total_results": len(matches),
         }
     except Exception as e:
         raise Exception(f"Error querying index: {str(e)}")
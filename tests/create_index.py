@@ -1,5 +1,4 @@
 import os
-from pathlib import Path
 from time import sleep
 
 from dotenv import load_dotenv
@@ -43,9 +42,13 @@ def create_index(index_name: str = "pro-roofers"):
         print(f"Index '{index_name}' created successfully")
         print("\nWaiting for index to be ready...")
 
-        # Wait for index to be ready
-        while not index_name in pc.list_indexes().names():
-            sleep(1)
+        # Wait for index to be ready, backing off between polls.
+        # describe_index returns just this index's status, a much smaller
+        # round-trip than listing every index once a second
+        backoff = 0.5
+        while not pc.describe_index(index_name).status["ready"]:
+            sleep(backoff)
+            backoff = min(backoff * 1.5, 10)
 
         print(f"Index '{index_name}' is ready")
 
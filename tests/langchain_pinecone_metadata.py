@@ -4,11 +4,7 @@ from datetime import datetime
 
 from dotenv import load_dotenv
 from langchain.chains.question_answering import load_qa_chain
-from langchain.document_loaders import (
-    OnlinePDFLoader,
-    PyPDFLoader,
-    UnstructuredPDFLoader,
-)
+from langchain.document_loaders import PyMuPDFLoader
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain.llms.openai import OpenAI
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -24,6 +20,61 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # API key for OpenAI
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")  # API key for Pinecone
 INDEX_NAME = "n8n"  # Name of the Pinecone index
 
+# Translation table replacing common artifacts in one C-level pass
+_ARTIFACT_TRANS = str.maketrans(
+    {
+        "\n": " ",
+        "\r": " ",
+        "\t": " ",
+        "\xa0": " ",  # Non-breaking spaces
+        "\u200b": "",  # Zero-width spaces
+    }
+)
+
+# Document-level metadata, stored once client-side and referenced from
+# each vector by doc_id. Pinecone caps metadata at 40KB/vector and every
+# byte rides along on each upsert and query response, so the bulky
+# descriptive fields stay out of the per-chunk payload.
+_DOC_META = {
+    "doc_id": "roof-inspections-v1",
+    "title": "Roof Inspections",
+    "category": "services",
+    "subcategory": "inspections",
+    "tags": ["roofing", "inspection", "maintenance", "roof care"],
+    "keywords": [
+        "roof inspections",
+        "leak prevention",
+        "roof maintenance",
+        "professional roof inspections",
+        "inspection checklist",
+        "roof inspection cost",
+    ],
+    "description": "A comprehensive guide to roof inspections, including benefits, steps, and pricing.",
+    "audience": ["residential homeowners", "commercial property managers"],
+    "purpose": "Educate users on the importance of regular roof inspections",
+    "question_intent": [
+        "What is included in a roof inspection?",
+        "How much does a roof inspection cost?",
+        "How often should I inspect my roof?",
+        "Why are roof inspections important?",
+    ],
+    "document_type": "markdown",
+    "date_created": "2023-11-15",
+    "date_last_updated": "2024-12-01",
+    "author": "Roofing Team",
+    "location": ["USA", "California", "Los Angeles"],
+    "related_docs": ["repairs.md", "pricing.md"],
+    "related_titles": ["Roof Repairs", "Roof Pricing Overview"],
+    "content_snippet": "Roof inspections are critical for identifying leaks and maintaining roof integrity.",
+}
+
+# Text cleanup patterns, compiled once at import time
+_RE_WS = re.compile(r"\s+")
+_RE_HYPHEN = re.compile(r"(?<=[a-z])-\s+(?=[a-z])")
+_RE_BROKEN = re.compile(r"([a-z])- ([a-z])")
+_RE_UNDER = re.compile(r"([a-z])_([a-z])")
+_RE_PUNCT = re.compile(r"\s+([.,!?])")
+
 
 def setup_pinecone(index_name):
     # Initialize Pinecone
@@ -49,23 +100,19 @@ def preprocess_text(text: str) -> str:
     Returns:
         str: Cleaned and preprocessed text
     """
-    # Replace common artifacts
-    text = text.replace("\n", " ")
-    text = text.replace("\r", " ")
-    text = text.replace("\t", " ")
-    text = text.replace("\xa0", " ")  # Replace non-breaking spaces
-    text = text.replace("\u200b", "")  # Remove zero-width spaces
+    # Replace common artifacts in a single pass
+    text = text.translate(_ARTIFACT_TRANS)
 
     # Fix spacing issues
-    text = re.sub(r"\s+", " ", text)
+    text = _RE_WS.sub(" ", text)
 
     # Fix common PDF artifacts
-    text = re.sub(r"(?<=[a-z])-\s+(?=[a-z])", "", text)  # Fix hyphenation
-    text = re.sub(r"([a-z])- ([a-z])", r"\1\2", text)  # Fix broken words
-    text = re.sub(r"([a-z])_([a-z])", r"\1\2", text)  # Fix underscores between words
+    text = _RE_HYPHEN.sub("", text)  # Fix hyphenation
+    text = _RE_BROKEN.sub(r"\1\2", text)  # Fix broken words
+    text = _RE_UNDER.sub(r"\1\2", text)  # Fix underscores between words
 
     # Clean up punctuation
-    text = re.sub(r"\s+([.,!?])", r"\1", text)
+    text = _RE_PUNCT.sub(r"\1", text)
 
     return text.strip()
 
@@ -82,43 +129,15 @@ def create_document_search(texts, embeddings, index_name):
     # Create documents with metadata
     documents = []
     for i, text in enumerate(texts):
-        # Extract existing metadata from the text object if it exists
-        existing_metadata = getattr(text, "metadata", {})
-
+        # Only the queryable, chunk-varying fields go into the vector
+        # payload; the descriptive bulk lives in _DOC_META under doc_id
         metadata = {
-            **existing_metadata,
             "source": text.metadata.get("source", "roofing_pdf"),
             "page": text.metadata.get("page", 0),
             "chunk_id": i,
-            "title": "Roof Inspections",
-            "category": "services",
-            "subcategory": "inspections",
-            "tags": ["roofing", "inspection", "maintenance", "roof care"],
-            "keywords": [
-                "roof inspections",
-                "leak prevention",
-                "roof maintenance",
-                "professional roof inspections",
-                "inspection checklist",
-                "roof inspection cost",
-            ],
-            "description": "A comprehensive guide to roof inspections, including benefits, steps, and pricing.",
-            "audience": ["residential homeowners", "commercial property managers"],
-            "purpose": "Educate users on the importance of regular roof inspections",
-            "question_intent": [
-                "What is included in a roof inspection?",
-                "How much does a roof inspection cost?",
-                "How often should I inspect my roof?",
-                "Why are roof inspections important?",
-            ],
-            "document_type": "markdown",
-            "date_created": "2023-11-15",
-            "date_last_updated": "2024-12-01",
-            "author": "Roofing Team",
-            "location": ["USA", "California", "Los Angeles"],
-            "related_docs": ["repairs.md", "pricing.md"],
-            "related_titles": ["Roof Repairs", "Roof Pricing Overview"],
-            "content_snippet": "Roof inspections are critical for identifying leaks and maintaining roof integrity.",
+            "doc_id": _DOC_META["doc_id"],
+            "title": _DOC_META["title"],
+            "category": _DOC_META["category"],
         }
 
         # Create new Document with cleaned text and metadata
@@ -134,8 +153,9 @@ def create_document_search(texts, embeddings, index_name):
 
 
 def process_pdf_file(pdf_path):
-    # Load PDF file
-    loader = PyPDFLoader(pdf_path)
+    # Load PDF file with PyMuPDF's native (libmupdf) parser, which is
+    # several times faster than pypdf on text extraction
+    loader = PyMuPDFLoader(pdf_path)
     file_content = loader.load()
 
     # Clean the text content and enhance metadata
@@ -193,9 +213,9 @@ def main():
     pdf_docs = process_pdf_file("files/common-questions-roofing.pdf")
     pdf_docsearch = create_document_search(pdf_docs, embeddings, index_name)
 
-    # Query with metadata filter
+    # Query with metadata filter on the compact per-chunk fields
     metadata_filter = {
-        "document_type": "roofing_guide",
+        "doc_id": _DOC_META["doc_id"],
         "source": "files/common-questions-roofing.pdf",
     }
 